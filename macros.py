@@ -0,0 +1,68 @@
+from functools import partial
+from typing import Callable
+
+# handlers that read the pressed button rather than acting on the entry alone
+button_handlers = ("add_digit", "math_operation")
+
+Instruction = Callable[[], object]
+
+
+class MacroRecorder:
+    """Records button presses into slots and compiles them into instruction tuples.
+
+    Each instruction is the already bound calculator handler, with the pressed button
+    passed in where the handler needs it, so running a macro does no name lookups at all.
+    The buttons themselves are connected through ``bind`` too, so clicks and playback
+    take the same path.
+    """
+
+    def __init__(self, calculator, button_actions: dict[str, str]) -> None:
+        self.calculator = calculator
+        self.button_actions = button_actions
+        self.macros: dict[int, tuple[Instruction, ...]] = {}
+        self.slot: int | None = None
+        self.buffer: list[str] = []
+
+    @property
+    def recording(self) -> bool:
+        return self.slot is not None
+
+    def toggle(self, slot: int) -> None:
+        if self.slot == slot:
+            self.stop()
+        else:
+            self.start(slot)
+
+    def start(self, slot: int) -> None:
+        self.stop()
+        self.slot = slot
+
+    def stop(self) -> None:
+        if self.slot is not None:
+            self.macros[self.slot] = self.compile(self.buffer)
+        self.slot = None
+        self.buffer = []
+
+    def record(self, button_name: str) -> None:
+        if self.recording and button_name in self.button_actions:
+            self.buffer.append(button_name)
+
+    def bind(self, button_name: str) -> Instruction:
+        action = self.button_actions[button_name]
+        handler = getattr(self.calculator, action)
+
+        if action in button_handlers:
+            return partial(handler, getattr(self.calculator.ui, button_name))
+
+        return handler
+
+    def compile(self, button_names: list[str]) -> tuple[Instruction, ...]:
+        return tuple(self.bind(name) for name in button_names)
+
+    def run(self, slot: int) -> None:
+        program = self.macros.get(slot)
+
+        if not program or self.recording:
+            return
+
+        self.calculator.run_program(program)
@@ -1,10 +1,13 @@
 import sys
+from functools import partial
 from operator import add, sub, mul, truediv
 
-from PySide6.QtGui import QFontDatabase
-from PySide6.QtWidgets import QApplication, QMainWindow
+from PySide6.QtGui import QFontDatabase, QKeySequence, QShortcut
+from PySide6.QtWidgets import QApplication, QInputDialog, QMainWindow, QPushButton
 
 from calc_design import Ui_MainWindow
+from macros import Instruction, MacroRecorder
+from units import IncompatibleUnits, convert
 
 operations = {
     "+": add,
@@ -13,12 +16,41 @@ operations = {
     "/": truediv
 }
 
+button_actions = {
+    "btn_0": "add_digit",
+    "btn_1": "add_digit",
+    "btn_2": "add_digit",
+    "btn_3": "add_digit",
+    "btn_4": "add_digit",
+    "btn_5": "add_digit",
+    "btn_6": "add_digit",
+    "btn_7": "add_digit",
+    "btn_8": "add_digit",
+    "btn_9": "add_digit",
+    "btn_c": "clear_all",
+    "btn_ce": "clear_entry",
+    "btn_point": "add_point",
+    "btn_neg": "add_neg",
+    "btn_backspace": "backspace",
+    "btn_result": "calc",
+    "btn_add": "math_operation",
+    "btn_minus": "math_operation",
+    "btn_mult": "math_operation",
+    "btn_div": "math_operation",
+}
+
 error_zero_div = "Division by zero"
 error_undefined = "Result undefined"
+error_units = "Unknown units"
+error_incompatible = "Incompatible units"
+error_too_large = "Result too large"
+error_too_small = "Result too small"
 
 default_font_size = 16
 default_entry_font_size = 40
 
+macro_slots = range(1, 10)
+
 
 class Calculator(QMainWindow):
     def __init__(self) -> None:
@@ -34,42 +66,52 @@ class Calculator(QMainWindow):
 
         self.entry_max_len = self.entry.maxLength()
 
-        # digits
-        self.ui.btn_0.clicked.connect(self.add_digit)
-        self.ui.btn_1.clicked.connect(self.add_digit)
-        self.ui.btn_2.clicked.connect(self.add_digit)
-        self.ui.btn_3.clicked.connect(self.add_digit)
-        self.ui.btn_4.clicked.connect(self.add_digit)
-        self.ui.btn_5.clicked.connect(self.add_digit)
-        self.ui.btn_6.clicked.connect(self.add_digit)
-        self.ui.btn_7.clicked.connect(self.add_digit)
-        self.ui.btn_8.clicked.connect(self.add_digit)
-        self.ui.btn_9.clicked.connect(self.add_digit)
-
-        # actions
-        self.ui.btn_c.clicked.connect(self.clear_all)
-        self.ui.btn_ce.clicked.connect(self.clear_entry)
-        self.ui.btn_point.clicked.connect(self.add_point)
-        self.ui.btn_neg.clicked.connect(self.add_neg)
-        self.ui.btn_backspace.clicked.connect(self.backspace)
-
-        # math
-        self.ui.btn_result.clicked.connect(self.calc)
-        self.ui.btn_add.clicked.connect(self.math_operation)
-        self.ui.btn_minus.clicked.connect(self.math_operation)
-        self.ui.btn_mult.clicked.connect(self.math_operation)
-        self.ui.btn_div.clicked.connect(self.math_operation)
+        self.title = self.windowTitle()
+
+        # macros: Alt+N starts/stops recording into slot N, Ctrl+N plays it back
+        self.macros = MacroRecorder(self, button_actions)
+
+        for name in button_actions:
+            btn = getattr(self.ui, name)
+            btn.clicked.connect(self.macros.bind(name))
+            btn.clicked.connect(partial(self.macros.record, name))
+
+        for slot in macro_slots:
+            QShortcut(QKeySequence(f"Alt+{slot}"), self).activated.connect(
+                lambda slot=slot: self.toggle_macro(slot)
+            )
+            QShortcut(QKeySequence(f"Ctrl+{slot}"), self).activated.connect(
+                lambda slot=slot: self.macros.run(slot)
+            )
+
+        # unit conversion of the entry value, e.g. "km to mi"
+        QShortcut(QKeySequence("Ctrl+U"), self).activated.connect(self.convert_units)
+
+    def toggle_macro(self, slot: int) -> None:
+        self.macros.toggle(slot)
+
+        if self.macros.recording:
+            self.setWindowTitle(f"{self.title} — recording macro {self.macros.slot}")
+        else:
+            self.setWindowTitle(self.title)
+
+    def run_program(self, program: tuple[Instruction, ...]) -> None:
+        self.setUpdatesEnabled(False)
+        try:
+            for instruction in program:
+                instruction()
+        finally:
+            self.setUpdatesEnabled(True)
 
     @staticmethod
     def remove_zeros(num: str) -> str:
         n = str(float(num))
         return n[:-2] if n[-2:] == ".0" else n
 
-    def add_digit(self) -> None:
+    def add_digit(self, btn: QPushButton) -> None:
         self.clear_error()
         self.replace_prev()
         self.clear_temp()
-        btn = self.sender()
 
         digit_buttons = ("btn_0", "btn_1", "btn_2", "btn_3", "btn_4",
                          "btn_5", "btn_6", "btn_7", "btn_8", "btn_9")
@@ -109,8 +151,7 @@ class Calculator(QMainWindow):
             self.entry.setText(self.entry.text() + ".")
             self.adjust_entry_font_size()
 
-    def add_temp(self) -> None:
-        btn = self.sender()
+    def add_temp(self, btn: QPushButton) -> None:
         entry = self.remove_zeros(self.entry.text())
 
         if not self.temp.text() or self.get_sign_from_temp() == "=":
@@ -190,16 +231,15 @@ class Calculator(QMainWindow):
                 else:
                     self.show_error(error_zero_div)
 
-    def math_operation(self) -> None:
+    def math_operation(self, btn: QPushButton) -> None:
         temp = self.temp.text()
-        btn = self.sender()
 
         if not temp:
-            self.add_temp()
+            self.add_temp(btn)
         else:
             if self.get_sign_from_temp() != btn.text():
                 if self.get_sign_from_temp() == "=":
-                    self.add_temp()
+                    self.add_temp(btn)
                 else:
                     self.temp.setText(temp[:-2] + f"{btn.text()} ")
             else:
@@ -207,13 +247,71 @@ class Calculator(QMainWindow):
 
         self.adjust_temp_font_size()
 
+    def convert_units(self) -> None:
+        self.clear_error()
+        self.clear_temp()
+
+        text, ok = QInputDialog.getText(self, "Convert", "Units (e.g. km to mi):")
+        if not ok:
+            return
+
+        parts = text.lower().split()
+        if "to" in parts:
+            i = parts.index("to")
+            parts = [" ".join(parts[:i]), " ".join(parts[i + 1:])]
+
+        value = self.get_entry_num()
+
+        try:
+            if len(parts) != 2 or not all(parts):
+                raise KeyError(text)
+            result = convert(value, *parts)
+
+        except KeyError:
+            self.show_error(error_units)
+
+        except IncompatibleUnits:
+            self.show_error(error_incompatible)
+
+        else:
+            result_text = self.format_result(result)
+
+            if result_text is None:
+                self.show_error(error_too_large if abs(result) >= 1 else error_too_small)
+            else:
+                self.entry.setMaxLength(self.entry_max_len)
+                self.entry.setText(result_text)
+                self.adjust_entry_font_size()
+
+    def format_result(self, result: float) -> str | None:
+        # plain positional notation the entry parser accepts, with decimals dropped
+        # only as far as needed to fit the entry field
+        text = self.remove_zeros(str(result))
+        if "e" not in text and len(text) <= self.entry_max_len:
+            return text
+
+        for decimals in range(self.entry_max_len, -1, -1):
+            text = f"{result:.{decimals}f}"
+            if "." in text:
+                text = text.rstrip("0").rstrip(".")
+            if len(text) <= self.entry_max_len:
+                break
+        else:
+            return None
+
+        if text in ("0", "-0") and result != 0:
+            return None
+
+        return text
+
     def show_error(self, error: str) -> None:
         self.entry.setMaxLength(len(error))
         self.entry.setText(error)
         self.adjust_entry_font_size()
 
     def clear_error(self) -> None:
-        if self.entry.text() in (error_undefined, error_zero_div):
+        if self.entry.text() in (error_undefined, error_zero_div, error_units, error_incompatible,
+                                 error_too_large, error_too_small):
             self.entry.setText("0")
             self.entry.setMaxLength(self.entry_max_len)
             self.adjust_entry_font_size()
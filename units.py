@@ -0,0 +1,123 @@
+from itertools import product
+
+# unit: (category, scale, offset, aliases); base value = value * scale + offset
+units = {
+    # length, base metre
+    "mm": ("length", 0.001, 0, ("millimetre", "millimeter")),
+    "cm": ("length", 0.01, 0, ("centimetre", "centimeter")),
+    "m": ("length", 1, 0, ("metre", "meter")),
+    "km": ("length", 1000, 0, ("kilometre", "kilometer")),
+    "in": ("length", 0.0254, 0, ("inch",)),
+    "ft": ("length", 0.3048, 0, ("foot", "feet")),
+    "yd": ("length", 0.9144, 0, ("yard",)),
+    "mi": ("length", 1609.344, 0, ("mile",)),
+    # mass, base kilogram
+    "mg": ("mass", 0.000001, 0, ("milligram",)),
+    "g": ("mass", 0.001, 0, ("gram",)),
+    "kg": ("mass", 1, 0, ("kilogram",)),
+    "t": ("mass", 1000, 0, ("tonne", "ton")),
+    "oz": ("mass", 0.028349523125, 0, ("ounce",)),
+    "lb": ("mass", 0.45359237, 0, ("pound", "lbs")),
+    # volume, base litre
+    "ml": ("volume", 0.001, 0, ("millilitre", "milliliter")),
+    "l": ("volume", 1, 0, ("litre", "liter")),
+    "m3": ("volume", 1000, 0, ("cubic metre", "cubic meter")),
+    "floz": ("volume", 0.0295735295625, 0, ("fluid ounce",)),
+    "cup": ("volume", 0.2365882365, 0, ()),
+    "pt": ("volume", 0.473176473, 0, ("pint",)),
+    "gal": ("volume", 3.785411784, 0, ("gallon",)),
+    # temperature, base kelvin
+    "k": ("temperature", 1, 0, ("kelvin",)),
+    "c": ("temperature", 1, 273.15, ("celsius",)),
+    "f": ("temperature", 5 / 9, 273.15 - 32 * 5 / 9, ("fahrenheit",)),
+    # data sizes, base byte
+    "bit": ("data", 0.125, 0, ()),
+    "b": ("data", 1, 0, ("byte",)),
+    "kb": ("data", 1000, 0, ("kilobyte",)),
+    "mb": ("data", 1000 ** 2, 0, ("megabyte",)),
+    "gb": ("data", 1000 ** 3, 0, ("gigabyte",)),
+    "tb": ("data", 1000 ** 4, 0, ("terabyte",)),
+    "kib": ("data", 1024, 0, ("kibibyte",)),
+    "mib": ("data", 1024 ** 2, 0, ("mebibyte",)),
+    "gib": ("data", 1024 ** 3, 0, ("gibibyte",)),
+    "tib": ("data", 1024 ** 4, 0, ("tebibyte",)),
+    # time, base second
+    "ms": ("time", 0.001, 0, ("millisecond",)),
+    "s": ("time", 1, 0, ("sec", "second")),
+    "min": ("time", 60, 0, ("minute",)),
+    "h": ("time", 3600, 0, ("hr", "hrs", "hour")),
+    "d": ("time", 86400, 0, ("day",)),
+    "wk": ("time", 604800, 0, ("week",)),
+    "yr": ("time", 31557600, 0, ("yrs", "year")),
+}
+
+
+class IncompatibleUnits(ValueError):
+    pass
+
+
+def build_conversions() -> dict[tuple[str, str], tuple[float, float]]:
+    """Every same-category unit pair mapped to (scale, offset): result = value * scale + offset."""
+    conversions = {}
+
+    for (a, (cat_a, scale_a, offset_a, _)), (b, (cat_b, scale_b, offset_b, _)) in product(units.items(), repeat=2):
+        if cat_a == cat_b:
+            conversions[a, b] = (scale_a / scale_b, (offset_a - offset_b) / scale_b)
+
+    return conversions
+
+
+def build_index() -> tuple[dict[str, str], dict[str, str]]:
+    """Unit names and aliases, plus unambiguous prefixes, mapped to their unit.
+
+    Returns the lookup index (exact names win over prefixes) and the whole words
+    (aliases and unit names of three letters or more) used for plurals. A prefix shared by several units is left out, so it doesn't
+    silently resolve to whichever unit was declared first.
+    """
+    exact = {}
+    words = {}
+    prefixes: dict[str, str | None] = {}
+
+    for unit, (_, _, _, aliases) in units.items():
+        for name in (unit, *aliases):
+            exact.setdefault(name, unit)
+            for i in range(1, len(name)):
+                prefix = name[:i]
+                prefixes[prefix] = unit if prefixes.get(prefix, unit) == unit else None
+        for word in (unit, *aliases) if len(unit) >= 3 else aliases:
+            words.setdefault(word, unit)
+
+    unambiguous = {prefix: unit for prefix, unit in prefixes.items() if unit is not None}
+
+    return unambiguous | exact, words
+
+
+conversions = build_conversions()
+index, words = build_index()
+
+
+def lookup(name: str) -> str | None:
+    name = " ".join(name.lower().split())
+
+    if name in index:
+        return index[name]
+
+    # plurals of whole words only ("miles", "cups"), never of prefixes or short abbreviations
+    return words.get(name.removesuffix("s")) or words.get(name.removesuffix("es"))
+
+
+def convert(value: int | float, src: str, dst: str) -> float:
+    """Convert value between unit names (as typed by the user).
+
+    Raises KeyError for an unknown unit name and IncompatibleUnits for units of different categories.
+    """
+    src_unit, dst_unit = lookup(src), lookup(dst)
+
+    if src_unit is None or dst_unit is None:
+        raise KeyError(src if src_unit is None else dst)
+
+    if (src_unit, dst_unit) not in conversions:
+        raise IncompatibleUnits(f"{src_unit} and {dst_unit} are incompatible")
+
+    scale, offset = conversions[src_unit, dst_unit]
+    return value * scale + offset